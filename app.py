@@ -1,9 +1,12 @@
 # Simpel APi serve html
 
-from flask import Flask, send_file, jsonify, render_template_string
+from flask import Flask, send_file, jsonify, render_template_string, request
+import gc
 import os
+import threading
 import time
 from datetime import datetime
+import psutil
 
 # Inisialisasi Flask app
 app = Flask(__name__)
@@ -11,6 +14,23 @@ app = Flask(__name__)
 # Konfigurasi folder untuk HTML files
 HTML_FOLDER = 'html_files'
 
+# Runtime metrics server, di-update incremental lewat request hooks
+# supaya /api/status?metrics=1 murah walaupun di-poll tiap detik
+START_MONOTONIC = time.monotonic()
+metrics_lock = threading.Lock()
+runtime_metrics = {
+    'requests_total': 0,
+    'requests_in_flight': 0,
+    'responses_by_status': {},
+    'bytes_served': {}
+}
+
+# Info proses (RSS, open fds) di-cache, maksimal di-refresh sekali per detik
+PROCESS_INFO_TTL = 1.0
+server_process = psutil.Process()
+process_info_lock = threading.Lock()
+process_info_cache = {'updated': None, 'rss_mb': None, 'open_fds': None}
+
 # Homepage
 HOME_TEMPLATE = '''
 <!DOCTYPE html>
@@ -76,6 +96,7 @@ HOME_TEMPLATE = '''
         <p><code>GET /api/html/&lt;size&gt;</code> - Download HTML file</p>
         <p><code>GET /api/info</code> - File information</p>
         <p><code>GET /api/status</code> - Server status</p>
+        <p><code>GET /api/status?metrics=1</code> - Server status + runtime metrics</p>
     </div>
     
     <p><small>Server time: {{ current_time }}</small></p>
@@ -83,6 +104,138 @@ HOME_TEMPLATE = '''
 </html>
 '''
 
+# Runtime metrics di level WSGI: send_file mengembalikan file wrapper dan body
+# baru dikirim server setelah request hooks Flask selesai, jadi request dianggap
+# in-flight sampai body selesai dikirim (close), dan bytes dihitung saat dikirim
+class TrackedBody:
+    """
+    Bungkus response body: hitung bytes yang benar-benar dikirim, update metrics saat close
+    """
+    def __init__(self, body, environ):
+        self.body = body
+        self.environ = environ
+        self.sent = 0
+        self.closed = False
+    
+    def __iter__(self):
+        for chunk in self.body:
+            self.sent += len(chunk)
+            yield chunk
+    
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if hasattr(self.body, 'close'):
+                self.body.close()
+        finally:
+            # Ukuran file di-set track_response, cuma untuk /api/html/<size>
+            size = self.environ.get('metrics.size')
+            with metrics_lock:
+                runtime_metrics['requests_in_flight'] -= 1
+                if size and self.sent:
+                    bytes_served = runtime_metrics['bytes_served']
+                    bytes_served[size] = bytes_served.get(size, 0) + self.sent
+
+class RuntimeMetricsMiddleware:
+    """
+    WSGI middleware untuk counter request in-flight
+    """
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        with metrics_lock:
+            runtime_metrics['requests_in_flight'] += 1
+        try:
+            body = self.wsgi_app(environ, start_response)
+        except Exception:
+            # Gagal sebelum ada response
+            with metrics_lock:
+                runtime_metrics['requests_in_flight'] -= 1
+            raise
+        return TrackedBody(body, environ)
+
+app.wsgi_app = RuntimeMetricsMiddleware(app.wsgi_app)
+
+# Request hooks untuk runtime metrics
+@app.before_request
+def track_request_start():
+    """
+    Hitung request masuk (poll /api/status?metrics=1 dari monitor tidak dihitung)
+    """
+    if request.endpoint == 'server_status' and request.args.get('metrics') in ('1', 'true'):
+        return
+    with metrics_lock:
+        runtime_metrics['requests_total'] += 1
+
+@app.after_request
+def track_response(response):
+    """
+    Hitung response per status code, dan tandai request file HTML untuk bytes served
+    """
+    with metrics_lock:
+        by_status = runtime_metrics['responses_by_status']
+        by_status[response.status_code] = by_status.get(response.status_code, 0) + 1
+    
+    # HEAD tidak kirim body; 206 (Range request) dihitung sesuai bagian yang dikirim
+    if (request.endpoint == 'serve_html' and request.method != 'HEAD'
+            and response.status_code in (200, 206)):
+        request.environ['metrics.size'] = request.view_args['size']
+    return response
+
+def get_process_info():
+    """
+    Ambil RSS dan open fds proses server, pakai cache supaya tidak baca /proc tiap request
+    
+    Returns:
+        dict: rss_mb dan open_fds
+    """
+    with process_info_lock:
+        now = time.monotonic()
+        updated = process_info_cache['updated']
+        if updated is None or now - updated >= PROCESS_INFO_TTL:
+            with server_process.oneshot():
+                process_info_cache['rss_mb'] = round(server_process.memory_info().rss / (1024 * 1024), 2)
+                if hasattr(server_process, 'num_fds'):
+                    process_info_cache['open_fds'] = server_process.num_fds()
+                else:
+                    process_info_cache['open_fds'] = server_process.num_handles()  # Windows
+            process_info_cache['updated'] = now
+        
+        return {
+            'rss_mb': process_info_cache['rss_mb'],
+            'open_fds': process_info_cache['open_fds']
+        }
+
+def get_runtime_metrics():
+    """
+    Snapshot runtime metrics server dari counter yang sudah ada
+    
+    Returns:
+        dict: Uptime, request counters, threads, memory, GC, dan bytes served
+    """
+    with metrics_lock:
+        counters = {
+            'requests_total': runtime_metrics['requests_total'],
+            # Request /api/status ini sendiri tidak ikut dihitung
+            'requests_in_flight': runtime_metrics['requests_in_flight'] - 1,
+            'responses_by_status': {str(code): count for code, count in runtime_metrics['responses_by_status'].items()},
+            'bytes_served': dict(runtime_metrics['bytes_served'])
+        }
+    
+    return {
+        'uptime_seconds': round(time.monotonic() - START_MONOTONIC, 2),
+        **counters,
+        'active_threads': threading.active_count(),
+        **get_process_info(),
+        'gc': {
+            'counts': gc.get_count(),
+            'generations': gc.get_stats()
+        }
+    }
+
 # Route 1: Home page - menampilkan dokumentasi dan daftar endpoints
 @app.route('/')
 def home():
@@ -201,16 +354,24 @@ def server_status():
     """
     Endpoint untuk cek status server
     
+    Query params:
+        metrics (str): Isi '1' untuk ikut tampilkan runtime metrics server
+    
     Returns:
         JSON: Status server dan informasi sistem
     """
-    return jsonify({
+    status = {
         'status': 'ok',
         'server': 'HTML File Server',
         'timestamp': datetime.now().isoformat(),
         'endpoints': ['/', '/api/html/<size>', '/api/info', '/api/status'],
         'sizes': ['small', 'medium', 'large', 'xlarge', 'xxlarge']
-    })
+    }
+    
+    if request.args.get('metrics') in ('1', 'true'):
+        status['runtime'] = get_runtime_metrics()
+    
+    return jsonify(status)
 
 # Error handler untuk 404
 @app.errorhandler(404)
@@ -250,7 +411,7 @@ if __name__ == '__main__':
     print("  /                     - Homepage")
     print("  /api/html/<size>      - Get HTML file")
     print("  /api/info             - File info")
-    print("  /api/status           - Server status")
+    print("  /api/status           - Server status (?metrics=1 untuk runtime metrics)")
     
     # Jalankan Flask server
     # Debug=True untuk development, ubah ke False untuk production
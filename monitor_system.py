@@ -9,68 +9,345 @@ import time
 import json
 import os
 import argparse
+from array import array
 from datetime import datetime
 import threading
+import urllib.request
+import numpy as np
 
 class SystemMonitor:
-    def __init__(self, interval=1, output_file='system_monitor.json'):
+    # Nama proses yang dianggap test-related kalau tidak ada target eksplisit
+    PROCESS_KEYWORDS = ('python', 'flask', 'locust')
+    
+    def __init__(self, interval=1, output_file='system_monitor.json',
+                 pids=None, ports=None, include_children=False,
+                 discovery_interval=10.0, slow_interval=None, status_url=None):
+        if interval <= 0:
+            raise ValueError(f"interval harus lebih dari 0 (dapat: {interval})")
+        
         self.interval = interval
         self.output_file = output_file
         self.running = False
         self.data = []
         
+        # Target proses: PID eksplisit, port yang di-listen, dan opsional child process
+        self.target_pids = set(pids or [])
+        self.target_ports = set(ports or [])
+        self.include_children = include_children
+        self.discovery_interval = discovery_interval
+        
+        # Cache handle psutil.Process supaya cpu_percent punya baseline antar sample
+        self._procs = {}
+        self._root_pids = set()
+        self._last_discovery = None
+        self._total_processes = None
+        self._cpu_count = psutil.cpu_count()
+        
+        # Metrics yang mahal (disk usage, swap, freq, proses) diambil maksimal
+        # sekali per slow_interval, supaya mode sampling < 100ms tetap ringan.
+        # Kalau slow_interval > interval, refresh jalan di thread terpisah dan
+        # sampler cuma baca snapshot terakhir; kalau tidak, refresh tiap sample
+        self.slow_interval = slow_interval if slow_interval is not None else max(interval, 1.0)
+        self._slow_every = max(1, round(self.slow_interval / interval))
+        self._slow_lock = threading.Lock()
+        self._slow_cache = None
+        self._slow_background = False
+        
+        # Opsional: poll /api/status?metrics=1 dari Flask server tiap slow_interval.
+        # Poll jalan di thread terpisah supaya HTTP yang lambat tidak menahan sampler
+        self.status_url = status_url
+        self._server_lock = threading.Lock()
+        self._server_snapshot = None
+        self._server_seq = 0
+        self._server_seq_seen = 0
+        
+        # Counter sample sebelumnya, untuk hitung rate per detik
+        self._prev_counters = None
+        self._prev_proc_ctx = {}
+    
+    def _discover_pids(self):
+        """Cari PID yang mau di-track (mahal, jadi cuma dipanggil sesekali)"""
+        pids = set()
+        
+        for pid in self.target_pids:
+            if psutil.pid_exists(pid):
+                pids.add(pid)
+        
+        if self.target_ports:
+            try:
+                for conn in psutil.net_connections(kind='inet'):
+                    if (conn.status == psutil.CONN_LISTEN and conn.pid
+                            and conn.laddr and conn.laddr.port in self.target_ports):
+                        pids.add(conn.pid)
+            except psutil.AccessDenied:
+                print("⚠️ Warning: butuh akses root untuk resolve port ke PID")
+        
+        # PID target eksplisit / pemilik port; kalau salah satunya mati, discovery dipaksa ulang
+        self._root_pids = set(pids)
+        
+        # Fallback ke cara lama (match nama) kalau tidak ada target eksplisit
+        if not self.target_pids and not self.target_ports:
+            for proc in psutil.process_iter(['name']):
+                name = (proc.info['name'] or '').lower()
+                if any(keyword in name for keyword in self.PROCESS_KEYWORDS):
+                    pids.add(proc.pid)
+        
+        if self.include_children:
+            for pid in list(pids):
+                try:
+                    for child in psutil.Process(pid).children(recursive=True):
+                        pids.add(child.pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+        
+        return pids
+    
+    def _refresh_processes(self, force=False):
+        """Update cache handle proses, pertahankan handle yang masih hidup"""
+        now = time.monotonic()
+        if (not force and self._last_discovery is not None
+                and now - self._last_discovery < self.discovery_interval):
+            return
+        
+        self._last_discovery = now
+        self._total_processes = len(psutil.pids())
+        pids = self._discover_pids()
+        
+        for pid in list(self._procs):
+            if pid not in pids:
+                del self._procs[pid]
+                self._prev_proc_ctx.pop(pid, None)
+        
+        for pid in pids:
+            if pid in self._procs:
+                continue
+            try:
+                proc = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            # Panggilan pertama cpu_percent selalu 0.0, jadi dipakai sebagai baseline
+            self._read_field(proc.cpu_percent, interval=None)
+            self._procs[pid] = proc
+    
+    @staticmethod
+    def _read_field(method, **kwargs):
+        """Panggil method psutil, hasilnya None kalau tidak punya akses (proses user lain)"""
+        try:
+            return method(**kwargs)
+        except psutil.AccessDenied:
+            return None
+    
+    def _sample_process(self, proc, memory_total):
+        """Ambil metrics satu proses dalam satu oneshot()"""
+        read = self._read_field
+        with proc.oneshot():
+            memory = read(proc.memory_info)
+            ctx = read(proc.num_ctx_switches)
+            if hasattr(proc, 'num_fds'):
+                open_fds = read(proc.num_fds)
+            else:
+                open_fds = read(proc.num_handles)  # Windows
+            
+            # Rate context switch sejak sample sebelumnya untuk proses ini
+            ctx_rate = None
+            if ctx is not None:
+                now = time.monotonic()
+                total_ctx = ctx.voluntary + ctx.involuntary
+                prev = self._prev_proc_ctx.get(proc.pid)
+                self._prev_proc_ctx[proc.pid] = (now, total_ctx)
+                if prev and now > prev[0]:
+                    ctx_rate = round(max(total_ctx - prev[1], 0) / (now - prev[0]), 2)
+            
+            return {
+                'pid': proc.pid,
+                'name': read(proc.name),
+                'cpu_percent': read(proc.cpu_percent, interval=None),
+                'memory_percent': round(memory.rss / memory_total * 100, 2) if memory else None,
+                'rss_mb': round(memory.rss / 1024**2, 2) if memory else None,
+                'threads': read(proc.num_threads),
+                'open_fds': open_fds,
+                'ctx_switches_voluntary': ctx.voluntary if ctx else None,
+                'ctx_switches_involuntary': ctx.involuntary if ctx else None,
+                'ctx_switches_per_s': ctx_rate
+            }
+    
+    def get_process_info(self, memory_total):
+        """Ambil metrics untuk semua proses yang di-track"""
+        self._refresh_processes()
+        
+        processes = []
+        dead = []
+        for pid, proc in self._procs.items():
+            try:
+                processes.append(self._sample_process(proc, memory_total))
+            except psutil.NoSuchProcess:
+                dead.append(pid)
+        
+        # Proses yang mati dibuang. Discovery ulang cuma dipaksa kalau yang mati
+        # target eksplisit/pemilik port, bukan proses hasil match nama atau child
+        for pid in dead:
+            del self._procs[pid]
+            self._prev_proc_ctx.pop(pid, None)
+            if pid in self._root_pids and (self.target_pids or self.target_ports):
+                self._last_discovery = None
+        
+        return processes
+        
+    def get_server_metrics(self):
+        """Ambil runtime metrics dari endpoint status server (kalau dikonfigurasi)"""
+        if not self.status_url:
+            return None
+        try:
+            with urllib.request.urlopen(self.status_url, timeout=0.5) as response:
+                return json.load(response).get('runtime')
+        except (OSError, ValueError):
+            return None
+    
+    def _run_every_slow_interval(self, callback, delay_first=False):
+        """Loop thread background: panggil callback tiap slow_interval selama monitoring jalan"""
+        next_deadline = time.monotonic()
+        if delay_first:
+            next_deadline += self.slow_interval
+        
+        while self.running:
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if not self.running:
+                return
+            
+            callback()
+            
+            next_deadline += self.slow_interval
+            if next_deadline < time.monotonic():
+                next_deadline = time.monotonic()
+    
+    def _poll_server_metrics(self):
+        """Ambil metrics server sekali, simpan sebagai snapshot terbaru"""
+        runtime = self.get_server_metrics()
+        if runtime is not None:
+            # Timestamp poll sendiri, dipakai untuk hitung rate request server
+            runtime['polled_epoch'] = time.time()
+            runtime['polled_monotonic'] = time.monotonic()
+            with self._server_lock:
+                self._server_snapshot = runtime
+                self._server_seq += 1
+    
+    def _poll_slow_info(self):
+        """Refresh metrics yang mahal di thread background"""
+        try:
+            slow = self._collect_slow_info(psutil.virtual_memory().total)
+        except Exception as e:
+            # Snapshot lama tetap dipakai, sampler tidak ikut error
+            print(f"⚠️ Warning: gagal refresh metrics lambat: {e}")
+            return
+        with self._slow_lock:
+            self._slow_cache = slow
+    
+    def _take_server_snapshot(self):
+        """Snapshot server terbaru, cuma sekali per poll (sample lain dapat None)"""
+        with self._server_lock:
+            if self._server_seq == self._server_seq_seen:
+                return None
+            self._server_seq_seen = self._server_seq
+            return self._server_snapshot
+    
+    def _get_slow_info(self, memory_total):
+        """Ambil metrics yang mahal: snapshot dari thread background, atau langsung"""
+        if self._slow_background:
+            with self._slow_lock:
+                return self._slow_cache
+        return self._collect_slow_info(memory_total)
+    
+    def _collect_slow_info(self, memory_total):
+        """Baca metrics yang mahal (disk usage, swap, freq, proses)"""
+        cpu_freq = psutil.cpu_freq()
+        swap = psutil.swap_memory()
+        disk = psutil.disk_usage('/')
+        
+        return {
+            'frequency_mhz': cpu_freq.current if cpu_freq else None,
+            'swap_percent': swap.percent,
+            'disk': {
+                'total_gb': round(disk.total / 1024**3, 2),
+                'free_gb': round(disk.free / 1024**3, 2),
+                'used_gb': round(disk.used / 1024**3, 2),
+                'percent': disk.percent
+            },
+            # Process info (Flask + Locust, pakai handle yang di-cache)
+            'test_related': self.get_process_info(memory_total)
+        }
+    
+    def _compute_rates(self, now, counters):
+        """Hitung rate per detik dari selisih counter kumulatif"""
+        prev = self._prev_counters
+        self._prev_counters = (now, counters)
+        
+        if prev is None or now <= prev[0]:
+            return None
+        
+        elapsed = now - prev[0]
+        return {
+            f'{key}_per_s': round(max(value - prev[1][key], 0) / elapsed, 2)
+            for key, value in counters.items()
+            if key in prev[1]
+        }
+    
     def get_system_info(self):
         """Ambil informasi sistem saat ini"""
         try:
             # CPU info
             cpu_percent = psutil.cpu_percent(interval=None)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
+            cpu_stats = psutil.cpu_stats()
             
             # Memory info
             memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
             
-            # Disk info
-            disk = psutil.disk_usage('/')
-            
-            # Network info
+            # Network dan disk I/O (counter kumulatif)
             network = psutil.net_io_counters()
+            disk_io = psutil.disk_io_counters()
             
-            # Process info (untuk Flask app)
-            flask_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    if 'python' in proc.info['name'].lower() or 'flask' in proc.info['name'].lower() or 'locust' in proc.info['name'].lower():
-                        flask_processes.append({
-                            'pid': proc.info['pid'],
-                            'name': proc.info['name'],
-                            'cpu_percent': proc.info['cpu_percent'],
-                            'memory_percent': proc.info['memory_percent']
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+            now = time.monotonic()
+            slow = self._get_slow_info(memory.total)
+            
+            counters = {
+                'net_bytes_sent': network.bytes_sent,
+                'net_bytes_recv': network.bytes_recv,
+                'net_packets_sent': network.packets_sent,
+                'net_packets_recv': network.packets_recv,
+                'ctx_switches': cpu_stats.ctx_switches
+            }
+            if disk_io:
+                counters.update({
+                    'disk_read_bytes': disk_io.read_bytes,
+                    'disk_write_bytes': disk_io.write_bytes,
+                    'disk_read_count': disk_io.read_count,
+                    'disk_write_count': disk_io.write_count
+                })
             
             return {
                 'timestamp': datetime.now().isoformat(),
                 'epoch': time.time(),
+                'monotonic': now,
                 'cpu': {
                     'percent': cpu_percent,
-                    'count': cpu_count,
-                    'frequency_mhz': cpu_freq.current if cpu_freq else None
+                    'count': self._cpu_count,
+                    'frequency_mhz': slow['frequency_mhz'],
+                    'ctx_switches': cpu_stats.ctx_switches
                 },
                 'memory': {
                     'total_gb': round(memory.total / 1024**3, 2),
                     'available_gb': round(memory.available / 1024**3, 2),
                     'used_gb': round(memory.used / 1024**3, 2),
                     'percent': memory.percent,
-                    'swap_percent': swap.percent
+                    'swap_percent': slow['swap_percent']
                 },
-                'disk': {
-                    'total_gb': round(disk.total / 1024**3, 2),
-                    'free_gb': round(disk.free / 1024**3, 2),
-                    'used_gb': round(disk.used / 1024**3, 2),
-                    'percent': disk.percent
+                'disk': slow['disk'],
+                'disk_io': {
+                    'read_bytes': disk_io.read_bytes if disk_io else None,
+                    'write_bytes': disk_io.write_bytes if disk_io else None,
+                    'read_count': disk_io.read_count if disk_io else None,
+                    'write_count': disk_io.write_count if disk_io else None
                 },
                 'network': {
                     'bytes_sent': network.bytes_sent,
@@ -78,10 +355,12 @@ class SystemMonitor:
                     'packets_sent': network.packets_sent,
                     'packets_recv': network.packets_recv
                 },
+                'rates': self._compute_rates(now, counters),
                 'processes': {
-                    'total_count': len(psutil.pids()),
-                    'test_related': flask_processes  # Flask + Locust processes
-                }
+                    'total_count': self._total_processes,
+                    'test_related': slow['test_related']  # Flask + Locust processes
+                },
+                'server': self._take_server_snapshot()
             }
         except Exception as e:
             return {
@@ -100,12 +379,56 @@ class SystemMonitor:
         self.running = True
         self.data = []
         
+        # Baseline untuk cpu_percent (sistem dan per proses)
+        psutil.cpu_percent(interval=None)
+        self._refresh_processes(force=True)
+        print(f"🎯 Tracking {len(self._procs)} process(es): {sorted(self._procs)}\n")
+        
+        if self.status_url:
+            threading.Thread(target=self._run_every_slow_interval,
+                             args=(self._poll_server_metrics,), daemon=True).start()
+        
+        # Metrics lambat di-refresh di background kalau lebih jarang dari sampling.
+        # Snapshot pertama diambil langsung supaya sample pertama sudah lengkap
+        if self._slow_every > 1:
+            self._slow_cache = self._collect_slow_info(psutil.virtual_memory().total)
+            self._slow_background = True
+            threading.Thread(target=self._run_every_slow_interval,
+                             args=(self._poll_slow_info, True), daemon=True).start()
+        
+        # Jadwal sampling pakai deadline di clock monotonic, jadi periode tidak
+        # drift walaupun get_system_info() butuh waktu
+        next_deadline = time.monotonic()
+        missed = 0
+        
+        # Print real-time stats maksimal sekali per detik (dihitung per tick)
+        print_every = max(1, round(1.0 / self.interval))
+        ticks = 0
+        
         try:
             while self.running:
+                now = time.monotonic()
+                if now < next_deadline:
+                    time.sleep(next_deadline - now)
+                    now = time.monotonic()
+                
                 info = self.get_system_info()
+                info['schedule'] = {
+                    'lateness_ms': round((now - next_deadline) * 1000, 3),
+                    'missed': missed
+                }
                 self.data.append(info)
                 
-                # Print real-time stats
+                # Kalau sampling telat lebih dari satu periode, tick yang lewat di-skip
+                next_deadline += self.interval
+                behind = time.monotonic() - next_deadline
+                missed = int(behind // self.interval) if behind > 0 else 0
+                next_deadline += missed * self.interval
+                
+                ticks += 1
+                if (ticks - 1) % print_every:
+                    continue
+                
                 if 'error' not in info:
                     cpu = info['cpu']['percent']
                     memory = info['memory']['percent']
@@ -115,16 +438,18 @@ class SystemMonitor:
                     cpu_color = "🔴" if cpu > 80 else "🟡" if cpu > 60 else "🟢"
                     mem_color = "🔴" if memory > 80 else "🟡" if memory > 60 else "🟢"
                     
+                    rates = info['rates'] or {}
+                    net_mb = (rates.get('net_bytes_sent_per_s', 0) + rates.get('net_bytes_recv_per_s', 0)) / 1024**2
+                    
                     print(f"{info['timestamp'][:19]} | "
                           f"CPU: {cpu_color} {cpu:5.1f}% | "
                           f"MEM: {mem_color} {memory:5.1f}% | "
                           f"DISK: {disk:5.1f}% | "
+                          f"NET: {net_mb:7.2f} MB/s | "
                           f"Test Processes: {len(info['processes']['test_related'])}")
                 else:
                     print(f"❌ Error: {info['error']}")
                 
-                time.sleep(self.interval)
-                
         except KeyboardInterrupt:
             print("\n🛑 Stopping monitoring...")
             self.stop_monitoring()
@@ -166,7 +491,13 @@ class SystemMonitor:
         cpu_values = [d['cpu']['percent'] for d in valid_data]
         memory_values = [d['memory']['percent'] for d in valid_data]
         
-        print(f"⏱️  Duration: {len(valid_data) * self.interval} seconds")
+        # Durasi dari clock monotonic kalau ada (data lama belum punya field ini)
+        if 'monotonic' in valid_data[0]:
+            duration = valid_data[-1]['monotonic'] - valid_data[0]['monotonic']
+        else:
+            duration = len(valid_data) * self.interval
+        
+        print(f"⏱️  Duration: {duration:.1f} seconds")
         print(f"📈 Samples: {len(valid_data)}")
         print()
         print("CPU Usage:")
@@ -180,6 +511,34 @@ class SystemMonitor:
         print(f"  📉 Minimum: {min(memory_values):.1f}%")
         print()
         
+        # Throughput dari rate per interval
+        rate_samples = [d['rates'] for d in valid_data if d.get('rates')]
+        if rate_samples:
+            print("Throughput (rata-rata / puncak):")
+            for key, label, scale, unit in (
+                ('net_bytes_sent_per_s', 'Net Sent', 1024**2, 'MB/s'),
+                ('net_bytes_recv_per_s', 'Net Recv', 1024**2, 'MB/s'),
+                ('disk_read_bytes_per_s', 'Disk Read', 1024**2, 'MB/s'),
+                ('disk_write_bytes_per_s', 'Disk Write', 1024**2, 'MB/s'),
+                ('ctx_switches_per_s', 'Ctx Switch', 1, '/s'),
+            ):
+                values = [r[key] / scale for r in rate_samples if key in r]
+                if values:
+                    print(f"  {label:<10}: {sum(values)/len(values):10.2f} / {max(values):10.2f} {unit}")
+            print()
+        
+        # Jitter scheduler (seberapa telat sample dari deadline-nya)
+        lateness = sorted(d['schedule']['lateness_ms'] for d in valid_data if 'schedule' in d)
+        if lateness:
+            missed = sum(d['schedule']['missed'] for d in valid_data if 'schedule' in d)
+            p95 = lateness[min(int(len(lateness) * 0.95), len(lateness) - 1)]
+            print("Sampling Jitter:")
+            print(f"  📊 Average: {sum(lateness)/len(lateness):.3f} ms")
+            print(f"  📈 P95: {p95:.3f} ms")
+            print(f"  🔺 Maximum: {lateness[-1]:.3f} ms")
+            print(f"  ⏭️  Missed ticks: {missed}")
+            print()
+        
         # System info
         last_sample = valid_data[-1]
         print("System Info:")
@@ -188,6 +547,294 @@ class SystemMonitor:
         print(f"  💿 Total Disk: {last_sample['disk']['total_gb']} GB")
         print("="*50)
 
+# Kolom yang diambil dari tiap sample untuk analisis: (nama kolom, section, key)
+ANALYSIS_COLUMNS = (
+    ('epoch', None, 'epoch'),
+    ('monotonic', None, 'monotonic'),
+    ('cpu_percent', 'cpu', 'percent'),
+    ('memory_percent', 'memory', 'percent'),
+    ('ctx_switches', 'cpu', 'ctx_switches'),
+    ('net_bytes_sent', 'network', 'bytes_sent'),
+    ('net_bytes_recv', 'network', 'bytes_recv'),
+    ('net_packets_sent', 'network', 'packets_sent'),
+    ('net_packets_recv', 'network', 'packets_recv'),
+    ('disk_read_bytes', 'disk_io', 'read_bytes'),
+    ('disk_write_bytes', 'disk_io', 'write_bytes'),
+    ('lateness_ms', 'schedule', 'lateness_ms'),
+    ('server_requests_total', 'server', 'requests_total'),
+    ('server_in_flight', 'server', 'requests_in_flight'),
+    ('server_rss_mb', 'server', 'rss_mb'),
+    ('server_threads', 'server', 'active_threads'),
+    ('server_polled_monotonic', 'server', 'polled_monotonic'),
+)
+
+# Counter yang waktunya diambil dari kolom lain (bukan waktu sample)
+RATE_TIME_COLUMNS = {'server_requests_total': 'server_polled_monotonic'}
+
+# Counter kumulatif yang diubah jadi rate per detik saat analisis
+RATE_COLUMNS = ('ctx_switches', 'net_bytes_sent', 'net_bytes_recv',
+                'net_packets_sent', 'net_packets_recv',
+                'disk_read_bytes', 'disk_write_bytes', 'server_requests_total')
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def iter_samples(path, chunk_size=1 << 20):
+    """
+    Baca sample satu per satu dari file monitor tanpa load seluruh file
+    
+    Bisa baca JSON array (output stop_monitoring) maupun JSON Lines.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    
+    with open(path, 'r') as f:
+        while True:
+            # Lewati whitespace dan tanda array/pemisah di antara sample
+            while pos < len(buf) and buf[pos] in ' \t\r\n,[]':
+                pos += 1
+            
+            if pos >= len(buf):
+                buf = f.read(chunk_size)
+                pos = 0
+                if not buf:
+                    return
+                continue
+            
+            try:
+                sample, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Sample terpotong di akhir chunk, baca chunk berikutnya
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            
+            yield sample
+
+
+def load_columns(path):
+    """
+    Stream file monitor ke array kolom (satu pass)
+    
+    Returns:
+        tuple: (dict nama kolom -> numpy array, sample valid terakhir, jumlah error)
+    """
+    nan = float('nan')
+    buffers = {name: array('d') for name, _, _ in ANALYSIS_COLUMNS}
+    last_sample = None
+    errors = 0
+    
+    for sample in iter_samples(path):
+        if 'error' in sample:
+            errors += 1
+            continue
+        
+        for name, section, key in ANALYSIS_COLUMNS:
+            source = sample.get(section) if section else sample
+            value = source.get(key) if source else None
+            buffers[name].append(nan if value is None else value)
+        last_sample = sample
+    
+    columns = {name: np.frombuffer(buf, dtype=np.float64) for name, buf in buffers.items()}
+    return columns, last_sample, errors
+
+
+def _describe(values):
+    """Statistik dasar + percentile, NaN diabaikan"""
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return None
+    
+    stats = {
+        'mean': float(values.mean()),
+        'min': float(values.min()),
+        'max': float(values.max())
+    }
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f'p{q}'] = float(value)
+    return stats
+
+
+def sample_times(columns):
+    """Timeline sample: clock monotonic kalau semua sample punya, kalau tidak pakai epoch"""
+    times = columns['monotonic']
+    if np.isnan(times).any():
+        times = columns['epoch']
+    return times
+
+
+def compute_rates(columns):
+    """
+    Rate per detik dari selisih counter kumulatif (vectorized)
+    
+    Counter yang jarang (misal metrics server yang cuma ada di sample hasil poll)
+    dihitung antar sample yang punya nilai saja, sample lain NaN.
+    
+    Returns:
+        dict: '<kolom>_per_s' -> numpy array, sample pertama bernilai NaN
+    """
+    times = sample_times(columns)
+    
+    rates = {}
+    for name in RATE_COLUMNS:
+        values = columns[name]
+        rate = np.full(values.size, np.nan)
+        valid = np.flatnonzero(~np.isnan(values))
+        
+        if valid.size > 1:
+            counter_times = times
+            if name in RATE_TIME_COLUMNS:
+                own = columns[RATE_TIME_COLUMNS[name]]
+                counter_times = np.where(np.isnan(own), times, own)
+            
+            elapsed = np.diff(counter_times[valid])
+            elapsed[elapsed <= 0] = np.nan
+            rate[valid[1:]] = np.clip(np.diff(values[valid]), 0, None) / elapsed
+        
+        rates[f'{name}_per_s'] = rate
+    return rates
+
+
+def analyze_columns(columns, window=10.0, thresholds=None):
+    """
+    Hitung percentile, agregat per window waktu, dan titik saturasi
+    
+    Args:
+        columns (dict): Output load_columns
+        window (float): Lebar window agregasi dalam detik
+        thresholds (dict): Batas saturasi per kolom, misal {'cpu_percent': 90}
+    
+    Returns:
+        dict: Hasil analisis
+    """
+    if thresholds is None:
+        thresholds = {'cpu_percent': 90.0, 'memory_percent': 90.0}
+    
+    times = sample_times(columns)
+    offsets = times - times[0]
+    
+    metrics = {
+        'cpu_percent': columns['cpu_percent'],
+        'memory_percent': columns['memory_percent'],
+        'lateness_ms': columns['lateness_ms'],
+        **compute_rates(columns)
+    }
+    
+    # Agregat per window waktu (mean dan max tiap metric)
+    bucket = (offsets // window).astype(np.int64)
+    n_windows = int(bucket[-1]) + 1
+    windows = {'start_s': np.arange(n_windows) * window}
+    for name in ('cpu_percent', 'memory_percent', 'net_bytes_sent_per_s', 'net_bytes_recv_per_s'):
+        values = metrics[name]
+        valid = ~np.isnan(values)
+        counts = np.bincount(bucket[valid], minlength=n_windows)
+        sums = np.bincount(bucket[valid], weights=values[valid], minlength=n_windows)
+        maxima = np.full(n_windows, np.nan)
+        np.fmax.at(maxima, bucket[valid], values[valid])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            windows[f'{name}_mean'] = sums / counts
+        windows[f'{name}_max'] = maxima
+    
+    # Saturasi: kapan pertama kali lewat batas, berapa lama, dan streak terpanjang
+    saturation = {}
+    for name, limit in thresholds.items():
+        above = metrics[name] >= limit
+        if not above.any():
+            saturation[name] = {'threshold': limit, 'fraction': 0.0,
+                                'first_at_s': None, 'longest_s': 0.0}
+            continue
+        
+        edges = np.diff(np.concatenate(([0], above.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        saturation[name] = {
+            'threshold': limit,
+            'fraction': float(above.mean()),
+            'first_at_s': float(offsets[starts[0]]),
+            'longest_s': float((offsets[ends] - offsets[starts]).max())
+        }
+    
+    return {
+        'samples': int(times.size),
+        'duration_s': float(offsets[-1]),
+        'stats': {name: _describe(values) for name, values in metrics.items()},
+        'windows': windows,
+        'saturation': saturation
+    }
+
+
+def print_analysis(result, last_sample=None, errors=0, top_windows=20):
+    """
+    Print hasil analyze_columns
+    
+    Kalau window lebih dari top_windows, yang ditampilkan cuma window dengan
+    CPU rata-rata tertinggi (tetap urut waktu) supaya capture panjang tidak
+    menghasilkan ribuan baris.
+    """
+    print("\n" + "="*50)
+    print("📊 MONITORING ANALYSIS")
+    print("="*50)
+    print(f"⏱️  Duration: {result['duration_s']:.1f} seconds")
+    print(f"📈 Samples: {result['samples']} (error: {errors})")
+    print()
+    
+    labels = (
+        ('cpu_percent', 'CPU %', 1),
+        ('memory_percent', 'Memory %', 1),
+        ('net_bytes_sent_per_s', 'Net Sent MB/s', 1024**2),
+        ('net_bytes_recv_per_s', 'Net Recv MB/s', 1024**2),
+        ('disk_read_bytes_per_s', 'Disk Read MB/s', 1024**2),
+        ('disk_write_bytes_per_s', 'Disk Write MB/s', 1024**2),
+        ('ctx_switches_per_s', 'Ctx Switch /s', 1),
+        ('lateness_ms', 'Jitter ms', 1),
+    )
+    header = ''.join(f"{col:>10}" for col in ('mean', 'min', 'p50', 'p95', 'p99', 'max'))
+    print(f"{'Metric':<16}{header}")
+    for name, label, scale in labels:
+        stats = result['stats'].get(name)
+        if not stats:
+            continue
+        row = ''.join(f"{stats[col] / scale:10.2f}" for col in ('mean', 'min', 'p50', 'p95', 'p99', 'max'))
+        print(f"{label:<16}{row}")
+    print()
+    
+    windows = result['windows']
+    cpu_means = windows['cpu_percent_mean']
+    shown = np.flatnonzero(~np.isnan(cpu_means))
+    if shown.size > top_windows:
+        print(f"Per Window, {top_windows} CPU tertinggi dari {shown.size} "
+              f"(CPU mean/max, Net Sent MB/s mean):")
+        shown = np.sort(shown[np.argsort(cpu_means[shown])[::-1][:top_windows]])
+    else:
+        print("Per Window (CPU mean/max, Net Sent MB/s mean):")
+    for i in shown:
+        start = windows['start_s'][i]
+        cpu_mean = cpu_means[i]
+        net = windows['net_bytes_sent_per_s_mean'][i] / 1024**2
+        print(f"  +{start:8.0f}s | CPU {cpu_mean:5.1f}% / {windows['cpu_percent_max'][i]:5.1f}% | "
+              f"Net {0.0 if np.isnan(net) else net:8.2f} MB/s")
+    print()
+    
+    print("Saturation:")
+    for name, sat in result['saturation'].items():
+        if sat['first_at_s'] is None:
+            print(f"  🟢 {name} tidak pernah >= {sat['threshold']:.0f}")
+        else:
+            print(f"  🔴 {name} >= {sat['threshold']:.0f}: {sat['fraction'] * 100:.1f}% waktu, "
+                  f"pertama di +{sat['first_at_s']:.1f}s, terlama {sat['longest_s']:.1f}s")
+    
+    if last_sample:
+        print()
+        print("System Info:")
+        print(f"  🖥️  CPU Cores: {last_sample['cpu']['count']}")
+        print(f"  💾 Total RAM: {last_sample['memory']['total_gb']} GB")
+        print(f"  💿 Total Disk: {last_sample['disk']['total_gb']} GB")
+    print("="*50)
+
 def main():
     parser = argparse.ArgumentParser(description='Monitor sistem selama load testing')
     parser.add_argument('-i', '--interval', type=float, default=1.0, 
@@ -196,17 +843,49 @@ def main():
                        help='File output untuk data monitoring (default: system_monitor.json)')
     parser.add_argument('--summary-only', action='store_true',
                        help='Hanya tampilkan summary dari file yang sudah ada')
+    parser.add_argument('-p', '--pid', type=int, action='append', default=[],
+                       help='PID proses yang di-track (bisa diulang)')
+    parser.add_argument('--port', type=int, action='append', default=[],
+                       help='Track proses yang listen di port ini, misal 5000 (bisa diulang)')
+    parser.add_argument('--tree', action='store_true',
+                       help='Ikut track semua child process dari target')
+    parser.add_argument('--slow-interval', type=float, default=None,
+                       help='Interval untuk metrics mahal (disk usage, swap, proses). '
+                            'Default: max(interval, 1.0), jadi -i 0.05 tetap ringan')
+    parser.add_argument('--status-url', type=str, default=None,
+                       help='Poll runtime metrics server, misal http://localhost:5000/api/status?metrics=1')
+    parser.add_argument('--window', type=float, default=10.0,
+                       help='Lebar window agregasi untuk --summary-only dalam detik (default: 10)')
+    parser.add_argument('--top-windows', type=int, default=20,
+                       help='Maksimal window yang di-print, diambil CPU tertinggi (default: 20)')
+    parser.add_argument('--cpu-threshold', type=float, default=90.0,
+                       help='Batas CPU %% untuk deteksi saturasi (default: 90)')
     
     args = parser.parse_args()
+    if args.interval <= 0:
+        parser.error('--interval harus lebih dari 0')
+    if args.window <= 0:
+        parser.error('--window harus lebih dari 0')
+    if args.top_windows <= 0:
+        parser.error('--top-windows harus lebih dari 0')
     
-    monitor = SystemMonitor(interval=args.interval, output_file=args.output)
+    monitor = SystemMonitor(interval=args.interval, output_file=args.output,
+                            pids=args.pid, ports=args.port,
+                            include_children=args.tree,
+                            slow_interval=args.slow_interval,
+                            status_url=args.status_url)
     
     if args.summary_only:
         if os.path.exists(args.output):
             try:
-                with open(args.output, 'r') as f:
-                    monitor.data = json.load(f)
-                monitor.print_summary()
+                columns, last_sample, errors = load_columns(args.output)
+                if last_sample is None:
+                    print("❌ No valid data collected")
+                    return
+                result = analyze_columns(columns, window=args.window,
+                                         thresholds={'cpu_percent': args.cpu_threshold,
+                                                     'memory_percent': 90.0})
+                print_analysis(result, last_sample, errors, top_windows=args.top_windows)
             except Exception as e:
                 print(f"❌ Error loading file: {e}")
         else:
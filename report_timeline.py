@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Script untuk bikin laporan timeline gabungan setelah load testing
+Menggabungkan stats history Locust, output SystemMonitor, dan locust_test_info.json
+ke satu timeline, lalu tulis report HTML self-contained (chart SVG inline)
+"""
+
+import argparse
+import csv
+import html
+import json
+import os
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+from monitor_system import load_columns, compute_rates
+
+# Kolom dari <prefix>_stats_history.csv Locust (--csv <prefix> --csv-full-history)
+LOCUST_COLUMNS = (
+    ('timestamp', 'Timestamp'),
+    ('users', 'User Count'),
+    ('rps', 'Requests/s'),
+    ('failures_per_s', 'Failures/s'),
+    ('p50_ms', '50%'),
+    ('p95_ms', '95%'),
+    ('p99_ms', '99%'),
+    ('total_requests', 'Total Request Count'),
+    ('avg_content_bytes', 'Total Average Content Size'),
+)
+
+
+def _to_float(value):
+    """Parse angka dari CSV Locust, 'N/A' atau kosong jadi NaN"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def load_locust_history(path, name='Aggregated'):
+    """
+    Stream stats history CSV Locust ke array kolom (baris per baris)
+
+    Args:
+        path (str): File <prefix>_stats_history.csv
+        name (str): Baris yang diambil, default total semua endpoint
+
+    Returns:
+        dict: nama kolom -> numpy array
+    """
+    buffers = {key: array('d') for key, _ in LOCUST_COLUMNS}
+
+    with open(path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            if row.get('Name') != name:
+                continue
+            for key, column in LOCUST_COLUMNS:
+                buffers[key].append(_to_float(row.get(column)))
+
+    return {key: np.frombuffer(buf, dtype=np.float64) for key, buf in buffers.items()}
+
+
+def load_test_info(path):
+    """Load locust_test_info.json (file kecil, ditulis save_test_info)"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def bucket_mean(times, values, t0, bucket, n_buckets):
+    """
+    Rata-rata nilai per bucket waktu, NaN diabaikan
+
+    Returns:
+        numpy array panjang n_buckets (NaN kalau bucket kosong)
+    """
+    index = ((times - t0) // bucket).astype(np.int64)
+    valid = ~np.isnan(values) & (index >= 0) & (index < n_buckets)
+    counts = np.bincount(index[valid], minlength=n_buckets)
+    sums = np.bincount(index[valid], weights=values[valid], minlength=n_buckets)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def find_knee(users, latency):
+    """
+    Cari concurrency knee: jumlah user di mana latency mulai naik tidak linear
+
+    Pakai metode Kneedle: kurva (users, latency rata-rata per level user)
+    dinormalisasi ke [0, 1], knee adalah titik yang paling jauh di bawah
+    garis lurus dari titik pertama ke titik terakhir.
+
+    Returns:
+        dict: users, latency_ms, dan kurva per level user; None kalau data kurang
+    """
+    valid = ~np.isnan(users) & ~np.isnan(latency) & (users > 0)
+    if not valid.any():
+        return None
+
+    levels, inverse = np.unique(users[valid], return_inverse=True)
+    mean_latency = np.bincount(inverse, weights=latency[valid]) / np.bincount(inverse)
+    curve = {'users': levels, 'latency_ms': mean_latency}
+
+    if levels.size < 3 or mean_latency[-1] <= mean_latency[0]:
+        return {'users': None, 'latency_ms': None, 'curve': curve}
+
+    x = (levels - levels[0]) / (levels[-1] - levels[0])
+    y = (mean_latency - mean_latency[0]) / (mean_latency[-1] - mean_latency[0])
+    distance = y - x
+    knee = int(np.argmin(distance))
+    if distance[knee] >= 0:
+        return {'users': None, 'latency_ms': None, 'curve': curve}
+
+    return {
+        'users': float(levels[knee]),
+        'latency_ms': float(mean_latency[knee]),
+        'curve': curve
+    }
+
+
+def app_bytes_rate(locust):
+    """
+    Bytes/s di level aplikasi per interval stats history Locust
+
+    'Total Average Content Size' adalah rata-rata sejak test mulai, jadi
+    dikali 'Total Request Count' jadi total bytes kumulatif; rate per interval
+    diambil dari selisihnya. Selisih negatif (stats di-reset) jadi NaN.
+
+    Returns:
+        numpy array bytes/s, baris pertama NaN
+    """
+    total_bytes = locust['total_requests'] * locust['avg_content_bytes']
+    elapsed = np.diff(locust['timestamp'])
+    delta = np.diff(total_bytes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = np.where((elapsed > 0) & (delta >= 0), delta / elapsed, np.nan)
+    return np.concatenate(([np.nan], rate))
+
+
+def _nanmean(values):
+    """Mean yang mengabaikan NaN, None kalau semua NaN"""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if values.size else None
+
+
+def build_timeline(locust=None, monitor=None, test_info=None, bucket=1.0, nic_mbps=None):
+    """
+    Gabungkan semua sumber ke satu timeline per bucket waktu
+
+    Args:
+        locust (dict): Output load_locust_history
+        monitor (dict): Output load_columns dari monitor_system
+        test_info (dict): Isi locust_test_info.json
+        bucket (float): Lebar bucket timeline dalam detik
+        nic_mbps (float): Kapasitas NIC dalam Mbit/s untuk hitung utilisasi
+
+    Returns:
+        dict: Timeline per bucket dan ringkasan korelasi
+    """
+    if locust is not None and not locust['timestamp'].size:
+        locust = None
+    if monitor is not None and not monitor['epoch'].size:
+        monitor = None
+    if locust is None and monitor is None:
+        raise ValueError('Tidak ada data untuk dibuat timeline')
+
+    # Range timeline ikut Locust kalau ada; sumber lain di-clip ke range ini.
+    # File lama (misal system_monitor.json dari run kemarin) yang tidak overlap di-skip
+    if locust is not None:
+        t0, t_end = float(np.nanmin(locust['timestamp'])), float(np.nanmax(locust['timestamp']))
+    else:
+        t0, t_end = float(np.nanmin(monitor['epoch'])), float(np.nanmax(monitor['epoch']))
+
+    skipped = []
+    if monitor is not None and locust is not None:
+        if np.nanmax(monitor['epoch']) < t0 or np.nanmin(monitor['epoch']) > t_end:
+            print("⚠️ Warning: data monitor tidak overlap dengan range Locust, di-skip")
+            monitor = None
+            skipped.append('monitor')
+
+    if test_info and test_info.get('test_start'):
+        slack = max(bucket, 10.0)
+        test_start = test_info['test_start']
+        test_end = max(test_info.get('test_end') or test_start, test_start)
+        if test_end < t0 - slack or test_start > t_end + slack:
+            print("⚠️ Warning: locust_test_info tidak overlap dengan timeline, di-skip")
+            test_info = None
+            skipped.append('test_info')
+
+    n_buckets = int((t_end - t0) // bucket) + 1
+    nan = np.full(n_buckets, np.nan)
+    timeline = {'offset_s': np.arange(n_buckets) * bucket}
+
+    if locust is not None:
+        times = locust['timestamp']
+        for key in ('users', 'rps', 'failures_per_s', 'p50_ms', 'p95_ms', 'p99_ms'):
+            timeline[key] = bucket_mean(times, locust[key], t0, bucket, n_buckets)
+        timeline['app_bytes_per_s'] = bucket_mean(
+            times, app_bytes_rate(locust), t0, bucket, n_buckets)
+
+    if monitor is not None:
+        times = monitor['epoch']
+        rates = compute_rates(monitor)
+        timeline['cpu_percent'] = bucket_mean(times, monitor['cpu_percent'], t0, bucket, n_buckets)
+        timeline['memory_percent'] = bucket_mean(times, monitor['memory_percent'], t0, bucket, n_buckets)
+        timeline['nic_sent_bytes_per_s'] = bucket_mean(times, rates['net_bytes_sent_per_s'], t0, bucket, n_buckets)
+        timeline['nic_recv_bytes_per_s'] = bucket_mean(times, rates['net_bytes_recv_per_s'], t0, bucket, n_buckets)
+        timeline['server_rps'] = bucket_mean(times, rates['server_requests_total_per_s'], t0, bucket, n_buckets)
+        timeline['server_in_flight'] = bucket_mean(times, monitor['server_in_flight'], t0, bucket, n_buckets)
+        timeline['server_rss_mb'] = bucket_mean(times, monitor['server_rss_mb'], t0, bucket, n_buckets)
+
+    # Korelasi antar sumber (hanya bucket yang punya data dari dua sisi)
+    rps = timeline.get('rps', nan)
+    cpu = timeline.get('cpu_percent', nan)
+    app_bytes = timeline.get('app_bytes_per_s', nan)
+    nic_bytes = timeline.get('nic_sent_bytes_per_s', nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rps_per_cpu = np.where(cpu >= 1.0, rps / cpu, np.nan)
+        wire_ratio = np.where(nic_bytes > 0, app_bytes / nic_bytes, np.nan)
+    timeline['rps_per_cpu_percent'] = rps_per_cpu
+
+    summary = {
+        'start': datetime.fromtimestamp(t0).isoformat(),
+        'duration_s': t_end - t0,
+        'skipped': skipped,
+        'bucket_s': bucket,
+        'mean_rps': _nanmean(rps),
+        'mean_cpu_percent': _nanmean(cpu),
+        'rps_per_cpu_percent': _nanmean(rps_per_cpu),
+        'mean_app_bytes_per_s': _nanmean(app_bytes),
+        'mean_nic_sent_bytes_per_s': _nanmean(nic_bytes),
+        'app_to_nic_ratio': _nanmean(wire_ratio),
+        'nic_utilization_percent': None,
+        'knee': find_knee(timeline.get('users', nan), timeline.get('p95_ms', nan))
+    }
+
+    if nic_mbps:
+        utilization = nic_bytes * 8 / (nic_mbps * 1e6) * 100
+        timeline['nic_utilization_percent'] = utilization
+        summary['nic_utilization_percent'] = _nanmean(utilization)
+        summary['peak_nic_utilization_percent'] = (
+            float(np.nanmax(utilization)) if not np.isnan(utilization).all() else None)
+
+    # Tandai periode test dari locust_test_info.json
+    if test_info:
+        test_start = test_info.get('test_start')
+        test_end = test_info.get('test_end')
+        if test_start:
+            summary['test_start_offset_s'] = float(test_start - t0)
+        if test_end and test_start and test_end > test_start:
+            summary['test_end_offset_s'] = float(test_end - t0)
+        summary['test_config'] = test_info.get('test_config')
+
+    return {'timeline': timeline, 'summary': summary}
+
+
+def svg_chart(x, series, title, y_label, width=900, height=260, markers=None, scatter=False):
+    """
+    Bikin line chart SVG inline (tanpa library JS)
+
+    Args:
+        x (numpy array): Nilai sumbu x
+        series (list): List (label, numpy array, warna)
+        markers (list): List (nilai x, label) untuk garis vertikal
+        scatter (bool): Gambar titik + garis, untuk data non-timeline
+
+    Returns:
+        str: Elemen <svg>
+    """
+    pad_left, pad_right, pad_top, pad_bottom = 60, 20, 30, 35
+    plot_w = width - pad_left - pad_right
+    plot_h = height - pad_top - pad_bottom
+
+    values = [v for _, v, _ in series if v is not None and not np.isnan(v).all()]
+    if not x.size or not values:
+        return f'<p class="empty">{html.escape(title)}: tidak ada data</p>'
+
+    x_min, x_max = float(np.nanmin(x)), float(np.nanmax(x))
+    y_max = max(float(np.nanmax(v)) for v in values) or 1.0
+    x_span = (x_max - x_min) or 1.0
+
+    def px(value):
+        return pad_left + (value - x_min) / x_span * plot_w
+
+    def py(value):
+        return pad_top + plot_h - value / y_max * plot_h
+
+    parts = [
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        f'<text x="{pad_left}" y="18" class="title">{html.escape(title)}</text>',
+        f'<line x1="{pad_left}" y1="{pad_top + plot_h}" x2="{width - pad_right}" y2="{pad_top + plot_h}" class="axis"/>',
+        f'<line x1="{pad_left}" y1="{pad_top}" x2="{pad_left}" y2="{pad_top + plot_h}" class="axis"/>',
+        f'<text x="{pad_left - 5}" y="{pad_top + 4}" class="tick" text-anchor="end">{y_max:.4g}</text>',
+        f'<text x="{pad_left - 5}" y="{pad_top + plot_h}" class="tick" text-anchor="end">0</text>',
+        f'<text x="{pad_left}" y="{height - 8}" class="tick">{x_min:.4g}</text>',
+        f'<text x="{width - pad_right}" y="{height - 8}" class="tick" text-anchor="end">{x_max:.4g}</text>',
+        f'<text x="12" y="{pad_top + plot_h / 2}" class="tick" transform="rotate(-90 12 {pad_top + plot_h / 2})" '
+        f'text-anchor="middle">{html.escape(y_label)}</text>',
+    ]
+
+    for marker_x, label in markers or []:
+        if x_min <= marker_x <= x_max:
+            parts.append(f'<line x1="{px(marker_x):.1f}" y1="{pad_top}" x2="{px(marker_x):.1f}" '
+                         f'y2="{pad_top + plot_h}" class="marker"/>')
+            parts.append(f'<text x="{px(marker_x) + 3:.1f}" y="{pad_top + 10}" class="tick">{html.escape(label)}</text>')
+
+    for i, (label, y, color) in enumerate(series):
+        if y is None or np.isnan(y).all():
+            continue
+        # Gambar per segmen supaya bucket kosong (NaN) jadi celah
+        valid = ~np.isnan(y)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], valid.astype(np.int8), [0]))))
+        for start, end in zip(edges[::2], edges[1::2]):
+            points = ' '.join(f'{px(a):.1f},{py(b):.1f}' for a, b in zip(x[start:end], y[start:end]))
+            parts.append(f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+        if scatter:
+            for a, b in zip(x[valid], y[valid]):
+                parts.append(f'<circle cx="{px(a):.1f}" cy="{py(b):.1f}" r="3" fill="{color}"/>')
+        parts.append(f'<text x="{width - pad_right - 150}" y="{pad_top + 12 + i * 14}" '
+                     f'class="tick" fill="{color}">{html.escape(label)}</text>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+REPORT_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Load Test Timeline Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+        h1 {{ color: #333; }}
+        h3 {{ color: #666; margin-top: 25px; }}
+        table {{ border-collapse: collapse; }}
+        td {{ padding: 4px 12px; border-bottom: 1px solid #eee; }}
+        td:first-child {{ color: #666; }}
+        svg {{ display: block; margin: 15px 0; background: #f9f9f9; border-radius: 4px; }}
+        .title {{ font-size: 13px; font-weight: bold; fill: #333; }}
+        .tick {{ font-size: 11px; fill: #666; }}
+        .axis {{ stroke: #999; }}
+        .marker {{ stroke: #cc0000; stroke-dasharray: 4 3; }}
+        .empty {{ color: #999; }}
+    </style>
+</head>
+<body>
+    <h1>Load Test Timeline Report</h1>
+    <p>Sumber: {sources}</p>
+
+    <h3>Summary</h3>
+    <table>
+{summary_rows}
+    </table>
+
+    <h3>Timeline</h3>
+{charts}
+
+    <h3>Concurrency Knee</h3>
+{knee_chart}
+
+    <p><small>Generated: {generated}</small></p>
+</body>
+</html>
+'''
+
+
+def _format(value, unit='', scale=1.0, digits=2):
+    """Format angka untuk tabel summary"""
+    if value is None:
+        return '-'
+    return f'{value / scale:,.{digits}f}{unit}'
+
+
+def render_report(result, sources):
+    """
+    Render hasil build_timeline jadi HTML self-contained
+
+    Returns:
+        str: Dokumen HTML
+    """
+    timeline = result['timeline']
+    summary = result['summary']
+    knee = summary['knee']
+    x = timeline['offset_s']
+
+    rows = [
+        ('Start', summary['start']),
+        ('Duration', _format(summary['duration_s'], ' s', digits=1)),
+        ('Bucket', _format(summary['bucket_s'], ' s', digits=1)),
+        ('Mean RPS (Locust)', _format(summary['mean_rps'])),
+        ('Mean CPU', _format(summary['mean_cpu_percent'], ' %')),
+        ('Throughput per CPU %', _format(summary['rps_per_cpu_percent'], ' req/s per %')),
+        ('App bytes/s (Locust)', _format(summary['mean_app_bytes_per_s'], ' MB/s', 1024**2)),
+        ('NIC sent bytes/s', _format(summary['mean_nic_sent_bytes_per_s'], ' MB/s', 1024**2)),
+        ('App / NIC ratio', _format(summary['app_to_nic_ratio'])),
+        ('NIC utilization (mean)', _format(summary['nic_utilization_percent'], ' %')),
+        ('NIC utilization (peak)', _format(summary.get('peak_nic_utilization_percent'), ' %')),
+        ('Concurrency knee', _format(knee and knee['users'], ' users', digits=0)),
+        ('p95 at knee', _format(knee and knee['latency_ms'], ' ms')),
+    ]
+    if summary.get('test_config'):
+        rows.append(('Test config', json.dumps(summary['test_config'])))
+    summary_rows = '\n'.join(
+        f'        <tr><td>{html.escape(label)}</td><td>{html.escape(str(value))}</td></tr>'
+        for label, value in rows)
+
+    markers = []
+    if 'test_start_offset_s' in summary:
+        markers.append((summary['test_start_offset_s'], 'test start'))
+    if 'test_end_offset_s' in summary:
+        markers.append((summary['test_end_offset_s'], 'test end'))
+
+    get = timeline.get
+    mb = 1024**2
+    charts = [
+        svg_chart(x, [('Locust RPS', get('rps'), '#0066cc'),
+                      ('Server RPS', get('server_rps'), '#00994d'),
+                      ('CPU %', get('cpu_percent'), '#cc6600')],
+                  'Throughput vs CPU', 'req/s, %', markers=markers),
+        svg_chart(x, [('p50 ms', get('p50_ms'), '#0066cc'),
+                      ('p95 ms', get('p95_ms'), '#cc6600'),
+                      ('p99 ms', get('p99_ms'), '#cc0000')],
+                  'Response Time (Locust)', 'ms', markers=markers),
+        svg_chart(x, [('Users', get('users'), '#6633cc'),
+                      ('Server in-flight', get('server_in_flight'), '#00994d')],
+                  'Concurrency', 'count', markers=markers),
+        svg_chart(x, [('App MB/s', get('app_bytes_per_s') / mb if 'app_bytes_per_s' in timeline else None, '#0066cc'),
+                      ('NIC sent MB/s', get('nic_sent_bytes_per_s') / mb if 'nic_sent_bytes_per_s' in timeline else None, '#cc6600'),
+                      ('NIC recv MB/s', get('nic_recv_bytes_per_s') / mb if 'nic_recv_bytes_per_s' in timeline else None, '#999999')],
+                  'Bytes/s: aplikasi vs NIC', 'MB/s', markers=markers),
+        svg_chart(x, [('Throughput per CPU %', get('rps_per_cpu_percent'), '#00994d')],
+                  'Throughput per CPU %', 'req/s per %', markers=markers),
+    ]
+
+    if knee:
+        knee_markers = [(knee['users'], 'knee')] if knee['users'] is not None else []
+        knee_chart = svg_chart(knee['curve']['users'], [('p95 ms', knee['curve']['latency_ms'], '#cc0000')],
+                               'Users vs p95 latency', 'ms', markers=knee_markers, scatter=True)
+    else:
+        knee_chart = '<p class="empty">Butuh data Locust untuk hitung knee</p>'
+
+    return REPORT_TEMPLATE.format(
+        sources=html.escape(', '.join(sources)),
+        summary_rows=summary_rows,
+        charts='\n'.join(charts),
+        knee_chart=knee_chart,
+        generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report timeline gabungan Locust + SystemMonitor + server metrics')
+    parser.add_argument('--locust-csv', type=str, default=None,
+                       help='Stats history Locust (<prefix>_stats_history.csv dari --csv <prefix> --csv-full-history)')
+    parser.add_argument('--monitor', type=str, default='system_monitor.json',
+                       help='Output monitor_system.py (default: system_monitor.json)')
+    parser.add_argument('--test-info', type=str, default='locust_test_info.json',
+                       help='Output save_test_info dari locustfile (default: locust_test_info.json)')
+    parser.add_argument('-b', '--bucket', type=float, default=1.0,
+                       help='Lebar bucket timeline dalam detik (default: 1.0)')
+    parser.add_argument('--nic-mbps', type=float, default=None,
+                       help='Kapasitas NIC dalam Mbit/s untuk hitung utilisasi (misal 1000)')
+    parser.add_argument('-o', '--output', type=str, default='load_test_report.html',
+                       help='File output report HTML (default: load_test_report.html)')
+
+    args = parser.parse_args()
+    if args.bucket <= 0:
+        parser.error('--bucket harus lebih dari 0')
+
+    locust = monitor = test_info = None
+    sources = {}
+
+    if args.locust_csv and os.path.exists(args.locust_csv):
+        locust = load_locust_history(args.locust_csv)
+        sources['locust'] = args.locust_csv
+        print(f"📈 Locust history: {locust['timestamp'].size} rows")
+    elif args.locust_csv:
+        print(f"⚠️ File {args.locust_csv} tidak ditemukan")
+
+    if os.path.exists(args.monitor):
+        monitor, _, errors = load_columns(args.monitor)
+        sources['monitor'] = args.monitor
+        print(f"🖥️  Monitor samples: {monitor['epoch'].size} (error: {errors})")
+
+    if os.path.exists(args.test_info):
+        test_info = load_test_info(args.test_info)
+        sources['test_info'] = args.test_info
+
+    try:
+        result = build_timeline(locust, monitor, test_info, bucket=args.bucket, nic_mbps=args.nic_mbps)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    with open(args.output, 'w') as f:
+        used = [path for key, path in sources.items() if key not in result['summary']['skipped']]
+        f.write(render_report(result, used))
+
+    summary = result['summary']
+    knee = summary['knee']
+    print(f"💾 Report saved to {args.output}")
+    print(f"⏱️  Duration: {summary['duration_s']:.1f} seconds")
+    print(f"📊 Throughput per CPU %: {_format(summary['rps_per_cpu_percent'])}")
+    print(f"🎯 Concurrency knee: {_format(knee and knee['users'], ' users', digits=0)}")
+
+if __name__ == "__main__":
+    main()